@@ -0,0 +1,192 @@
+import json
+import sqlite3
+import time
+import threading
+from typing import List, Optional
+
+from modelos import Job, StatusJob
+
+# Colunas persistidas para cada job na fila
+COLUNAS_JOB = (
+    "id",
+    "batch_id",
+    "title",
+    "language",
+    "status",
+    "script",
+    "audio_url",
+    "error",
+    "worker_id",
+    "timings",
+    "usage",
+    "created_at",
+    "updated_at",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    batch_id TEXT,
+    title TEXT,
+    language TEXT NOT NULL,
+    status TEXT NOT NULL,
+    script TEXT,
+    audio_url TEXT,
+    error TEXT,
+    worker_id TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    timings TEXT,
+    usage TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, seq);
+CREATE INDEX IF NOT EXISTS idx_jobs_batch ON jobs (batch_id);
+"""
+
+# Colunas guardadas como JSON (tempos por fase e uso de tokens)
+COLUNAS_JSON = ("timings", "usage")
+
+
+class FilaJobs:
+    """Fila durável de jobs em SQLite, compartilhada entre a API e os workers.
+
+    A API enfileira jobs com status "pending"; cada processo worker reserva
+    um job por vez de forma atômica, processa e grava o resultado de volta.
+    Jobs em "processing" cujo worker sumiu por mais de `lease_segundos` voltam
+    a ficar disponíveis para outro worker; depois de `max_tentativas` reservas
+    o job é marcado como "failed" em vez de derrubar workers indefinidamente.
+    """
+
+    def __init__(self, caminho: str, lease_segundos: int = 600, max_tentativas: int = 3):
+        self.caminho = caminho
+        self.lease_segundos = lease_segundos
+        self.max_tentativas = max_tentativas
+        self._local = threading.local()
+        self._conexao().executescript(SCHEMA)
+
+    def _conexao(self) -> sqlite3.Connection:
+        """Retorna a conexão da thread atual (sqlite3 não compartilha conexões entre threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _para_job(row: sqlite3.Row) -> Job:
+        return Job(
+            id=row["id"],
+            language=row["language"],
+            status=StatusJob(row["status"]),
+            title=row["title"],
+            batch_id=row["batch_id"],
+            script=row["script"],
+            audio_url=row["audio_url"],
+            error=row["error"],
+            timings=json.loads(row["timings"]) if row["timings"] is not None else None,
+            usage=json.loads(row["usage"]) if row["usage"] is not None else None,
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+        )
+
+    @staticmethod
+    def _para_coluna(coluna: str, valor):
+        if coluna in COLUNAS_JSON and valor is not None:
+            return json.dumps(valor)
+        if isinstance(valor, StatusJob):
+            return valor.value
+        return valor
+
+    def enfileirar(self, jobs: List[Job]):
+        """Insere jobs pendentes na fila em uma única transação"""
+        conn = self._conexao()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                f"INSERT INTO jobs ({', '.join(COLUNAS_JOB)}) "
+                f"VALUES ({', '.join('?' for _ in COLUNAS_JOB)})",
+                [
+                    tuple(self._para_coluna(coluna, getattr(job, coluna, None)) for coluna in COLUNAS_JOB)
+                    for job in jobs
+                ],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def reservar(self, worker_id: str) -> Optional[Job]:
+        """Reserva atomicamente o próximo job disponível para o worker"""
+        agora = time.time()
+        expirado = agora - self.lease_segundos
+
+        conn = self._conexao()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            while True:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'pending' "
+                    "OR (status = 'processing' AND updated_at < ?) "
+                    "ORDER BY seq LIMIT 1",
+                    (expirado,),
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                if row["attempts"] < self.max_tentativas:
+                    break
+
+                # Job já reservado vezes demais (provavelmente derruba o worker): desiste dele
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, worker_id = NULL, updated_at = ? WHERE id = ?",
+                    (f"Job abandonado após {row['attempts']} tentativas", agora, row["id"]),
+                )
+
+            conn.execute(
+                "UPDATE jobs SET status = 'processing', worker_id = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE id = ?",
+                (worker_id, agora, row["id"]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        job = self._para_job(row)
+        job.status = StatusJob.PROCESSING
+        job.updated_at = agora
+        return job
+
+    def atualizar(self, job_id: str, worker_id: str, **campos) -> bool:
+        """Grava campos do job (script, audio_url, status, error, timings...) se o worker ainda o detém.
+
+        Retorna False quando o lease expirou e o job foi reservado por outro worker;
+        nesse caso nada é gravado.
+        """
+        campos["updated_at"] = time.time()
+        colunas = [coluna for coluna in campos if coluna in COLUNAS_JOB]
+        cursor = self._conexao().execute(
+            f"UPDATE jobs SET {', '.join(f'{coluna} = ?' for coluna in colunas)} "
+            "WHERE id = ? AND worker_id = ?",
+            [self._para_coluna(coluna, campos[coluna]) for coluna in colunas] + [job_id, worker_id],
+        )
+        return cursor.rowcount > 0
+
+    def obter(self, job_id: str) -> Optional[Job]:
+        """Retorna um job pelo id, ou None se não existir"""
+        row = self._conexao().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._para_job(row) if row is not None else None
+
+    def obter_batch(self, batch_id: str) -> List[Job]:
+        """Retorna todos os jobs de um batch na ordem em que foram enfileirados"""
+        rows = self._conexao().execute(
+            "SELECT * FROM jobs WHERE batch_id = ? ORDER BY seq", (batch_id,)
+        ).fetchall()
+        return [self._para_job(row) for row in rows]
+
@@ -0,0 +1,181 @@
+import os
+from typing import Dict, Optional, Tuple
+from openai import OpenAI
+
+from telemetria import medir_fase, registrar_uso
+
+# Configuração do cliente OpenAI (usando variável de ambiente)
+client = OpenAI()
+
+# Diretório dos áudios gerados (deve ser compartilhado entre API e workers)
+AUDIO_DIR = "static/audio"
+os.makedirs(AUDIO_DIR, exist_ok=True)
+
+# Configurações culturais por idioma
+CULTURAS_POR_IDIOMA = {
+    "pt-BR": {
+        "nome_exemplo": "João",
+        "contexto": "no Brasil, em uma favela do Rio de Janeiro",
+        "expressoes": ["mano", "cara", "tipo assim", "saca?"],
+        "voz": "alloy"
+    },
+    "en-US": {
+        "nome_exemplo": "Mike",
+        "contexto": "in New York City, downtown Manhattan",
+        "expressoes": ["dude", "like", "you know", "literally"],
+        "voz": "echo"
+    },
+    "es-ES": {
+        "nome_exemplo": "Carlos",
+        "contexto": "en Madrid, España, en el barrio de Malasaña",
+        "expressoes": ["tío", "vale", "ostras", "flipante"],
+        "voz": "fable"
+    },
+    "fr-FR": {
+        "nome_exemplo": "Pierre",
+        "contexto": "à Paris, dans le Marais",
+        "expressoes": ["putain", "grave", "en fait", "voilà"],
+        "voz": "onyx"
+    },
+    "de-DE": {
+        "nome_exemplo": "Hans",
+        "contexto": "in Berlin, Deutschland, in Kreuzberg",
+        "expressoes": ["krass", "echt", "genau", "halt"],
+        "voz": "nova"
+    },
+    "it-IT": {
+        "nome_exemplo": "Marco",
+        "contexto": "a Roma, Italia, nel quartiere Trastevere",
+        "expressoes": ["dai", "boh", "cioè", "vabbè"],
+        "voz": "shimmer"
+    }
+}
+
+# Funções auxiliares
+def gerar_prompt_cultural(titulo: str, idioma: str) -> str:
+    """Gera um prompt específico para o idioma com contexto cultural autêntico"""
+    cultura = CULTURAS_POR_IDIOMA.get(idioma, CULTURAS_POR_IDIOMA["en-US"])
+    
+    if idioma == "pt-BR":
+        prompt = f"""Você é um roteirista brasileiro criativo. Crie um roteiro ORIGINAL e AUTÊNTICO em português brasileiro sobre o tema: "{titulo}".
+
+IMPORTANTE - Adaptação Cultural Brasileira:
+- Use nomes brasileiros típicos (ex: {cultura['nome_exemplo']}, Maria, José)
+- Inclua gírias e expressões brasileiras naturais: {', '.join(cultura['expressoes'])}
+- Situe a história {cultura['contexto']}
+- Use referências culturais brasileiras (comidas, lugares, costumes)
+- Tom informal e próximo, como brasileiros falam no dia a dia
+
+O roteiro deve ter entre 150-200 palavras, ser envolvente e soar 100% natural para um brasileiro.
+Não traduza de outros idiomas - crie algo ORIGINAL em português brasileiro."""
+
+    elif idioma == "en-US":
+        prompt = f"""You are a creative American scriptwriter. Create an ORIGINAL and AUTHENTIC script in American English about: "{titulo}".
+
+IMPORTANT - American Cultural Adaptation:
+- Use typical American names (e.g., {cultura['nome_exemplo']}, Sarah, John)
+- Include natural American slang and expressions: {', '.join(cultura['expressoes'])}
+- Set the story {cultura['contexto']}
+- Use American cultural references (foods, places, customs)
+- Casual and relatable tone, like Americans speak in everyday life
+
+The script should be 150-200 words, engaging, and sound 100% natural to an American.
+Don't translate from other languages - create something ORIGINAL in American English."""
+
+    elif idioma == "es-ES":
+        prompt = f"""Eres un guionista español creativo. Crea un guion ORIGINAL y AUTÉNTICO en español de España sobre: "{titulo}".
+
+IMPORTANTE - Adaptación Cultural Española:
+- Usa nombres españoles típicos (ej: {cultura['nome_exemplo']}, María, Javier)
+- Incluye jerga y expresiones españolas naturales: {', '.join(cultura['expressoes'])}
+- Sitúa la historia {cultura['contexto']}
+- Usa referencias culturales españolas (comidas, lugares, costumbres)
+- Tono informal y cercano, como hablan los españoles en el día a día
+
+El guion debe tener entre 150-200 palabras, ser atractivo y sonar 100% natural para un español.
+No traduzcas de otros idiomas - crea algo ORIGINAL en español de España."""
+
+    elif idioma == "fr-FR":
+        prompt = f"""Tu es un scénariste français créatif. Crée un script ORIGINAL et AUTHENTIQUE en français sur: "{titulo}".
+
+IMPORTANT - Adaptation Culturelle Française:
+- Utilise des prénoms français typiques (ex: {cultura['nome_exemplo']}, Marie, Jean)
+- Inclus de l'argot et des expressions françaises naturelles: {', '.join(cultura['expressoes'])}
+- Situe l'histoire {cultura['contexto']}
+- Utilise des références culturelles françaises (nourriture, lieux, coutumes)
+- Ton informel et proche, comme les Français parlent au quotidien
+
+Le script doit faire entre 150-200 mots, être captivant et sonner 100% naturel pour un Français.
+Ne traduis pas d'autres langues - crée quelque chose d'ORIGINAL en français."""
+
+    elif idioma == "de-DE":
+        prompt = f"""Du bist ein kreativer deutscher Drehbuchautor. Erstelle ein ORIGINALES und AUTHENTISCHES Skript auf Deutsch über: "{titulo}".
+
+WICHTIG - Deutsche Kulturelle Anpassung:
+- Verwende typische deutsche Namen (z.B. {cultura['nome_exemplo']}, Anna, Michael)
+- Füge natürliche deutsche Slang und Ausdrücke ein: {', '.join(cultura['expressoes'])}
+- Setze die Geschichte {cultura['contexto']}
+- Verwende deutsche kulturelle Referenzen (Essen, Orte, Bräuche)
+- Informeller und nahbarer Ton, wie Deutsche im Alltag sprechen
+
+Das Skript sollte 150-200 Wörter haben, fesselnd sein und 100% natürlich für einen Deutschen klingen.
+Übersetze nicht aus anderen Sprachen - erstelle etwas ORIGINALES auf Deutsch."""
+
+    elif idioma == "it-IT":
+        prompt = f"""Sei uno sceneggiatore italiano creativo. Crea uno script ORIGINALE e AUTENTICO in italiano su: "{titulo}".
+
+IMPORTANTE - Adattamento Culturale Italiano:
+- Usa nomi italiani tipici (es: {cultura['nome_exemplo']}, Giulia, Luca)
+- Includi slang ed espressioni italiane naturali: {', '.join(cultura['expressoes'])}
+- Ambienta la storia {cultura['contexto']}
+- Usa riferimenti culturali italiani (cibo, luoghi, costumi)
+- Tono informale e vicino, come parlano gli italiani nella vita quotidiana
+
+Lo script deve essere di 150-200 parole, coinvolgente e suonare 100% naturale per un italiano.
+Non tradurre da altre lingue - crea qualcosa di ORIGINALE in italiano."""
+
+    else:
+        prompt = f"Create an original script about: {titulo}. Length: 150-200 words."
+    
+    return prompt
+
+def gerar_roteiro(titulo: str, idioma: str, tempos: Dict[str, float]) -> Tuple[str, Optional[dict]]:
+    """Gera o roteiro com prompt cultural para o idioma e retorna (roteiro, uso de tokens)"""
+    with medir_fase(tempos, "prompt"):
+        prompt = gerar_prompt_cultural(titulo, idioma)
+    
+    with medir_fase(tempos, "chat", model="gpt-4.1-mini", language=idioma):
+        response = client.chat.completions.create(
+            model="gpt-4.1-mini",
+            messages=[
+                {"role": "system", "content": "You are a creative scriptwriter who creates authentic, culturally-adapted content."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.8,
+            max_tokens=500
+        )
+        uso = registrar_uso(response.usage)
+    
+    return response.choices[0].message.content.strip(), uso
+
+def gerar_audio(job_id: str, roteiro: str, idioma: str, tempos: Dict[str, float]) -> str:
+    """Gera o áudio do roteiro com a voz do idioma e retorna a URL do arquivo"""
+    cultura = CULTURAS_POR_IDIOMA.get(idioma, CULTURAS_POR_IDIOMA["en-US"])
+    voz = cultura["voz"]
+    
+    with medir_fase(tempos, "tts", model="tts-1", voice=voz):
+        audio_response = client.audio.speech.create(
+            model="tts-1",
+            voice=voz,
+            input=roteiro
+        )
+    
+    # Salvar áudio
+    audio_filename = f"{job_id}.mp3"
+    audio_path = os.path.join(AUDIO_DIR, audio_filename)
+    
+    with medir_fase(tempos, "write"):
+        with open(audio_path, "wb") as f:
+            f.write(audio_response.content)
+    
+    return f"/static/audio/{audio_filename}"
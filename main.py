@@ -1,66 +1,33 @@
 import os
 import uuid
+import time
 import asyncio
-from datetime import datetime
+from collections import Counter
 from typing import List, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, ORJSONResponse
 from pydantic import BaseModel
-from openai import OpenAI
 
-app = FastAPI()
+from fila_jobs import FilaJobs
+from modelos import Job, StatusJob
+from telemetria import span_job, resumir_tempos
+from geracao import gerar_roteiro, gerar_audio
 
-# Configuração do cliente OpenAI (usando variável de ambiente)
-client = OpenAI()
+app = FastAPI()
 
 # Armazenamento em memória para jobs e batches
-jobs_db: Dict[str, dict] = {}
+jobs_db: Dict[str, Job] = {}
 batches_db: Dict[str, dict] = {}
 
 # ThreadPoolExecutor para processamento paralelo
 executor = ThreadPoolExecutor(max_workers=5)
 
-# Configurações culturais por idioma
-CULTURAS_POR_IDIOMA = {
-    "pt-BR": {
-        "nome_exemplo": "João",
-        "contexto": "no Brasil, em uma favela do Rio de Janeiro",
-        "expressoes": ["mano", "cara", "tipo assim", "saca?"],
-        "voz": "alloy"
-    },
-    "en-US": {
-        "nome_exemplo": "Mike",
-        "contexto": "in New York City, downtown Manhattan",
-        "expressoes": ["dude", "like", "you know", "literally"],
-        "voz": "echo"
-    },
-    "es-ES": {
-        "nome_exemplo": "Carlos",
-        "contexto": "en Madrid, España, en el barrio de Malasaña",
-        "expressoes": ["tío", "vale", "ostras", "flipante"],
-        "voz": "fable"
-    },
-    "fr-FR": {
-        "nome_exemplo": "Pierre",
-        "contexto": "à Paris, dans le Marais",
-        "expressoes": ["putain", "grave", "en fait", "voilà"],
-        "voz": "onyx"
-    },
-    "de-DE": {
-        "nome_exemplo": "Hans",
-        "contexto": "in Berlin, Deutschland, in Kreuzberg",
-        "expressoes": ["krass", "echt", "genau", "halt"],
-        "voz": "nova"
-    },
-    "it-IT": {
-        "nome_exemplo": "Marco",
-        "contexto": "a Roma, Italia, nel quartiere Trastevere",
-        "expressoes": ["dai", "boh", "cioè", "vabbè"],
-        "voz": "shimmer"
-    }
-}
+# Fila compartilhada (SQLite) opcional: com BOLT_FILA_DB definido, a API só
+# enfileira jobs e o processamento fica a cargo de processos `worker.py`
+FILA_DB = os.getenv("BOLT_FILA_DB")
+fila = FilaJobs(FILA_DB) if FILA_DB else None
 
 # Modelos de dados
 class ScriptRequest(BaseModel):
@@ -77,143 +44,49 @@ class BatchRequest(BaseModel):
     batch_size: int = 5
 
 # Funções auxiliares
-def gerar_prompt_cultural(titulo: str, idioma: str) -> str:
-    """Gera um prompt específico para o idioma com contexto cultural autêntico"""
-    cultura = CULTURAS_POR_IDIOMA.get(idioma, CULTURAS_POR_IDIOMA["en-US"])
-    
-    if idioma == "pt-BR":
-        prompt = f"""Você é um roteirista brasileiro criativo. Crie um roteiro ORIGINAL e AUTÊNTICO em português brasileiro sobre o tema: "{titulo}".
-
-IMPORTANTE - Adaptação Cultural Brasileira:
-- Use nomes brasileiros típicos (ex: {cultura['nome_exemplo']}, Maria, José)
-- Inclua gírias e expressões brasileiras naturais: {', '.join(cultura['expressoes'])}
-- Situe a história {cultura['contexto']}
-- Use referências culturais brasileiras (comidas, lugares, costumes)
-- Tom informal e próximo, como brasileiros falam no dia a dia
-
-O roteiro deve ter entre 150-200 palavras, ser envolvente e soar 100% natural para um brasileiro.
-Não traduza de outros idiomas - crie algo ORIGINAL em português brasileiro."""
-
-    elif idioma == "en-US":
-        prompt = f"""You are a creative American scriptwriter. Create an ORIGINAL and AUTHENTIC script in American English about: "{titulo}".
-
-IMPORTANT - American Cultural Adaptation:
-- Use typical American names (e.g., {cultura['nome_exemplo']}, Sarah, John)
-- Include natural American slang and expressions: {', '.join(cultura['expressoes'])}
-- Set the story {cultura['contexto']}
-- Use American cultural references (foods, places, customs)
-- Casual and relatable tone, like Americans speak in everyday life
-
-The script should be 150-200 words, engaging, and sound 100% natural to an American.
-Don't translate from other languages - create something ORIGINAL in American English."""
-
-    elif idioma == "es-ES":
-        prompt = f"""Eres un guionista español creativo. Crea un guion ORIGINAL y AUTÉNTICO en español de España sobre: "{titulo}".
-
-IMPORTANTE - Adaptación Cultural Española:
-- Usa nombres españoles típicos (ej: {cultura['nome_exemplo']}, María, Javier)
-- Incluye jerga y expresiones españolas naturales: {', '.join(cultura['expressoes'])}
-- Sitúa la historia {cultura['contexto']}
-- Usa referencias culturales españolas (comidas, lugares, costumbres)
-- Tono informal y cercano, como hablan los españoles en el día a día
-
-El guion debe tener entre 150-200 palabras, ser atractivo y sonar 100% natural para un español.
-No traduzcas de otros idiomas - crea algo ORIGINAL en español de España."""
-
-    elif idioma == "fr-FR":
-        prompt = f"""Tu es un scénariste français créatif. Crée un script ORIGINAL et AUTHENTIQUE en français sur: "{titulo}".
-
-IMPORTANT - Adaptation Culturelle Française:
-- Utilise des prénoms français typiques (ex: {cultura['nome_exemplo']}, Marie, Jean)
-- Inclus de l'argot et des expressions françaises naturelles: {', '.join(cultura['expressoes'])}
-- Situe l'histoire {cultura['contexto']}
-- Utilise des références culturelles françaises (nourriture, lieux, coutumes)
-- Ton informel et proche, comme les Français parlent au quotidien
-
-Le script doit faire entre 150-200 mots, être captivant et sonner 100% naturel pour un Français.
-Ne traduis pas d'autres langues - crée quelque chose d'ORIGINAL en français."""
-
-    elif idioma == "de-DE":
-        prompt = f"""Du bist ein kreativer deutscher Drehbuchautor. Erstelle ein ORIGINALES und AUTHENTISCHES Skript auf Deutsch über: "{titulo}".
-
-WICHTIG - Deutsche Kulturelle Anpassung:
-- Verwende typische deutsche Namen (z.B. {cultura['nome_exemplo']}, Anna, Michael)
-- Füge natürliche deutsche Slang und Ausdrücke ein: {', '.join(cultura['expressoes'])}
-- Setze die Geschichte {cultura['contexto']}
-- Verwende deutsche kulturelle Referenzen (Essen, Orte, Bräuche)
-- Informeller und nahbarer Ton, wie Deutsche im Alltag sprechen
-
-Das Skript sollte 150-200 Wörter haben, fesselnd sein und 100% natürlich für einen Deutschen klingen.
-Übersetze nicht aus anderen Sprachen - erstelle etwas ORIGINALES auf Deutsch."""
-
-    elif idioma == "it-IT":
-        prompt = f"""Sei uno sceneggiatore italiano creativo. Crea uno script ORIGINALE e AUTENTICO in italiano su: "{titulo}".
-
-IMPORTANTE - Adattamento Culturale Italiano:
-- Usa nomi italiani tipici (es: {cultura['nome_exemplo']}, Giulia, Luca)
-- Includi slang ed espressioni italiane naturali: {', '.join(cultura['expressoes'])}
-- Ambienta la storia {cultura['contexto']}
-- Usa riferimenti culturali italiani (cibo, luoghi, costumi)
-- Tono informale e vicino, come parlano gli italiani nella vita quotidiana
-
-Lo script deve essere di 150-200 parole, coinvolgente e suonare 100% naturale per un italiano.
-Non tradurre da altre lingue - crea qualcosa di ORIGINALE in italiano."""
-
-    else:
-        prompt = f"Create an original script about: {titulo}. Length: 150-200 words."
-    
-    return prompt
-
-def processar_job_individual(job_id: str, titulo: str, idioma: str):
+def processar_job_individual(job: Job, enfileirado_em: float):
     """Processa um job individual (roteiro + áudio)"""
+    inicio = time.monotonic()
+    tempos = {"queued_ms": round((inicio - enfileirado_em) * 1000, 1)}
     try:
         # Atualizar status para "processing"
-        jobs_db[job_id]["status"] = "processing"
-        jobs_db[job_id]["updated_at"] = datetime.now().isoformat()
-        
-        # Gerar roteiro com prompt cultural
-        prompt = gerar_prompt_cultural(titulo, idioma)
-        
-        response = client.chat.completions.create(
-            model="gpt-4.1-mini",
-            messages=[
-                {"role": "system", "content": "You are a creative scriptwriter who creates authentic, culturally-adapted content."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.8,
-            max_tokens=500
-        )
+        job.timings = dict(tempos)
+        job.atualizar_status(StatusJob.PROCESSING)
         
-        roteiro = response.choices[0].message.content.strip()
-        jobs_db[job_id]["script"] = roteiro
+        with span_job(job.id, job.language):
+            job.script, job.usage = gerar_roteiro(job.title, job.language, tempos)
+            job.audio_url = gerar_audio(job.id, job.script, job.language, tempos)
         
-        # Gerar áudio
-        cultura = CULTURAS_POR_IDIOMA.get(idioma, CULTURAS_POR_IDIOMA["en-US"])
-        voz = cultura["voz"]
-        
-        audio_response = client.audio.speech.create(
-            model="tts-1",
-            voice=voz,
-            input=roteiro
-        )
-        
-        # Salvar áudio
-        audio_filename = f"{job_id}.mp3"
-        audio_path = f"static/audio/{audio_filename}"
-        
-        with open(audio_path, "wb") as f:
-            f.write(audio_response.content)
-        
-        jobs_db[job_id]["audio_url"] = f"/static/audio/{audio_filename}"
-        jobs_db[job_id]["status"] = "completed"
-        jobs_db[job_id]["updated_at"] = datetime.now().isoformat()
+        status = StatusJob.COMPLETED
         
     except Exception as e:
-        jobs_db[job_id]["status"] = "failed"
-        jobs_db[job_id]["error"] = str(e)
-        jobs_db[job_id]["updated_at"] = datetime.now().isoformat()
+        job.error = str(e)
+        status = StatusJob.FAILED
+    
+    tempos["total_ms"] = round((time.monotonic() - inicio) * 1000, 1)
+    job.timings = tempos
+    job.atualizar_status(status)
+
+def enviar_jobs(jobs: List[Job]):
+    """Envia jobs para processamento: fila compartilhada (workers externos) ou executor local"""
+    if fila is not None:
+        fila.enfileirar(jobs)
+        return
+    
+    enfileirado_em = time.monotonic()
+    for job in jobs:
+        jobs_db[job.id] = job
+        executor.submit(processar_job_individual, job, enfileirado_em)
+
+def obter_job(job_id: str) -> Optional[Job]:
+    """Busca um job na fila compartilhada ou na memória local"""
+    if fila is not None:
+        return fila.obter(job_id) or jobs_db.get(job_id)
+    return jobs_db.get(job_id)
 
 # Endpoints
+# Endpoints que acessam a fila SQLite são `def` (não `async def`): o FastAPI os
+# executa no threadpool, sem bloquear o event loop com o lock de escrita do SQLite
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """Serve a página HTML principal"""
@@ -221,107 +94,72 @@ async def root():
         return f.read()
 
 @app.post("/generate_script")
-async def generate_script(request: ScriptRequest):
+def generate_script(request: ScriptRequest):
     """Endpoint para gerar roteiro individual"""
-    job_id = str(uuid.uuid4())
-    
-    jobs_db[job_id] = {
-        "id": job_id,
-        "title": request.title,
-        "language": request.language,
-        "status": "pending",
-        "script": None,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
-    }
+    job = Job(id=str(uuid.uuid4()), title=request.title, language=request.language)
     
     # Processar em background
-    executor.submit(processar_job_individual, job_id, request.title, request.language)
+    enviar_jobs([job])
     
-    return {"job_id": job_id}
+    return {"job_id": job.id}
 
 @app.post("/generate_audio")
-async def generate_audio(request: AudioRequest):
-    """Endpoint para gerar áudio individual"""
-    job_id = str(uuid.uuid4())
-    
-    jobs_db[job_id] = {
-        "id": job_id,
-        "language": request.language,
-        "status": "processing",
-        "audio_url": None,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
-    }
-    
+def generate_audio(request: AudioRequest):
+    """Endpoint para gerar áudio individual (síncrono fora do event loop, ou via fila)"""
+    if fila is not None:
+        # Roteiro já preenchido: o worker pula a etapa de chat e só gera o áudio
+        job = Job(id=str(uuid.uuid4()), language=request.language, script=request.script)
+        fila.enfileirar([job])
+        return {"job_id": job.id}
+    
+    job = Job(id=str(uuid.uuid4()), language=request.language, status=StatusJob.PROCESSING)
+    jobs_db[job.id] = job
+    
+    tempos = {}
     try:
-        cultura = CULTURAS_POR_IDIOMA.get(request.language, CULTURAS_POR_IDIOMA["en-US"])
-        voz = cultura["voz"]
-        
-        audio_response = client.audio.speech.create(
-            model="tts-1",
-            voice=voz,
-            input=request.script
-        )
-        
-        audio_filename = f"{job_id}.mp3"
-        audio_path = f"static/audio/{audio_filename}"
-        
-        with open(audio_path, "wb") as f:
-            f.write(audio_response.content)
-        
-        jobs_db[job_id]["audio_url"] = f"/static/audio/{audio_filename}"
-        jobs_db[job_id]["status"] = "completed"
-        jobs_db[job_id]["updated_at"] = datetime.now().isoformat()
+        with span_job(job.id, job.language):
+            job.audio_url = gerar_audio(job.id, request.script, job.language, tempos)
+        status = StatusJob.COMPLETED
         
     except Exception as e:
-        jobs_db[job_id]["status"] = "failed"
-        jobs_db[job_id]["error"] = str(e)
-        jobs_db[job_id]["updated_at"] = datetime.now().isoformat()
+        job.error = str(e)
+        status = StatusJob.FAILED
     
-    return {"job_id": job_id}
+    job.timings = tempos
+    job.atualizar_status(status)
+    
+    return {"job_id": job.id}
 
 @app.post("/generate_batch")
-async def generate_batch(request: BatchRequest):
+def generate_batch(request: BatchRequest):
     """Endpoint para processamento em lote"""
     batch_id = str(uuid.uuid4())
-    job_ids = []
+    agora = time.time()
     
     # Criar jobs para cada combinação título × idioma
-    for titulo in request.titles:
-        for idioma in request.languages:
-            job_id = str(uuid.uuid4())
-            
-            jobs_db[job_id] = {
-                "id": job_id,
-                "batch_id": batch_id,
-                "title": titulo,
-                "language": idioma,
-                "status": "pending",
-                "script": None,
-                "audio_url": None,
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat()
-            }
-            
-            job_ids.append(job_id)
-    
-    # Criar batch
-    batches_db[batch_id] = {
-        "id": batch_id,
-        "job_ids": job_ids,
-        "total_jobs": len(job_ids),
-        "completed_jobs": 0,
-        "failed_jobs": 0,
-        "status": "processing",
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
-    }
+    jobs = [
+        Job(id=str(uuid.uuid4()), batch_id=batch_id, title=titulo, language=idioma, created_at=agora)
+        for titulo in request.titles
+        for idioma in request.languages
+    ]
+    
+    job_ids = [job.id for job in jobs]
+    
+    # Criar batch (com a fila, o batch é derivado dos jobs persistidos)
+    if fila is None:
+        batches_db[batch_id] = {
+            "id": batch_id,
+            "job_ids": job_ids,
+            "total_jobs": len(job_ids),
+            "completed_jobs": 0,
+            "failed_jobs": 0,
+            "status": "processing",
+            "created_at": agora,
+            "updated_at": agora
+        }
     
-    # Processar jobs em paralelo (máximo batch_size simultâneos)
-    for job_id in job_ids:
-        job = jobs_db[job_id]
-        executor.submit(processar_job_individual, job_id, job["title"], job["language"])
+    # Processar jobs em paralelo (executor local ou workers da fila)
+    enviar_jobs(jobs)
     
     return {
         "batch_id": batch_id,
@@ -330,19 +168,34 @@ async def generate_batch(request: BatchRequest):
     }
 
 @app.get("/batch_status/{batch_id}")
-async def batch_status(batch_id: str):
+def batch_status(batch_id: str):
     """Retorna o status de um batch"""
-    if batch_id not in batches_db:
-        raise HTTPException(status_code=404, detail="Batch não encontrado")
-    
-    batch = batches_db[batch_id]
-    jobs = [jobs_db[job_id] for job_id in batch["job_ids"]]
+    if fila is not None:
+        # Batch montado a partir da fila: continua disponível após reiniciar a API
+        jobs = fila.obter_batch(batch_id)
+        if not jobs:
+            raise HTTPException(status_code=404, detail="Batch não encontrado")
+        
+        batch = {
+            "id": batch_id,
+            "job_ids": [job.id for job in jobs],
+            "total_jobs": len(jobs),
+            "status": "processing",
+            "created_at": jobs[0].created_at
+        }
+    else:
+        if batch_id not in batches_db:
+            raise HTTPException(status_code=404, detail="Batch não encontrado")
+        
+        batch = batches_db[batch_id]
+        jobs = [jobs_db[job_id] for job_id in batch["job_ids"]]
     
-    # Atualizar contadores
-    completed = sum(1 for job in jobs if job["status"] == "completed")
-    failed = sum(1 for job in jobs if job["status"] == "failed")
-    processing = sum(1 for job in jobs if job["status"] == "processing")
-    pending = sum(1 for job in jobs if job["status"] == "pending")
+    # Atualizar contadores (uma única passada pelos jobs)
+    contagem = Counter(job.status for job in jobs)
+    completed = contagem[StatusJob.COMPLETED]
+    failed = contagem[StatusJob.FAILED]
+    processing = contagem[StatusJob.PROCESSING]
+    pending = contagem[StatusJob.PENDING]
     
     batch["completed_jobs"] = completed
     batch["failed_jobs"] = failed
@@ -351,9 +204,10 @@ async def batch_status(batch_id: str):
     if completed + failed == batch["total_jobs"]:
         batch["status"] = "completed"
     
-    batch["updated_at"] = datetime.now().isoformat()
+    batch["updated_at"] = time.time()
     
-    return {
+    # Jobs (dataclasses) vão direto para o orjson, sem o encoder genérico do FastAPI
+    return ORJSONResponse({
         "batch": batch,
         "jobs": jobs,
         "progress": {
@@ -362,16 +216,18 @@ async def batch_status(batch_id: str):
             "processing": processing,
             "pending": pending,
             "total": batch["total_jobs"]
-        }
-    }
+        },
+        "timings": resumir_tempos(jobs)
+    })
 
 @app.get("/job_status/{job_id}")
-async def job_status(job_id: str):
+def job_status(job_id: str):
     """Retorna o status de um job individual"""
-    if job_id not in jobs_db:
+    job = obter_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job não encontrado")
     
-    return jobs_db[job_id]
+    return ORJSONResponse(job)
 
 # Montar arquivos estáticos
 app.mount("/static", StaticFiles(directory="static"), name="static")
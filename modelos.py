@@ -0,0 +1,43 @@
+import time
+from enum import Enum
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+class StatusJob(str, Enum):
+    """Estados possíveis de um job"""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class Job:
+    """Registro de um job (roteiro + áudio).
+
+    Usa `__slots__` e timestamps numéricos (epoch em segundos) para manter
+    cada job retido em memória pequeno; é serializado direto pelo orjson,
+    sem passar pelo encoder genérico do FastAPI.
+    """
+    id: str
+    language: str
+    status: StatusJob = StatusJob.PENDING
+    title: Optional[str] = None
+    batch_id: Optional[str] = None
+    script: Optional[str] = None
+    audio_url: Optional[str] = None
+    error: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None
+    usage: Optional[Dict[str, int]] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = 0.0
+
+    def __post_init__(self):
+        if not self.updated_at:
+            self.updated_at = self.created_at
+
+    def atualizar_status(self, status: StatusJob):
+        """Muda o status e registra o momento da atualização"""
+        self.status = status
+        self.updated_at = time.time()
@@ -0,0 +1,79 @@
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+from modelos import Job
+
+# OpenTelemetry é opcional: sem o pacote instalado, só os tempos são registrados
+try:
+    from opentelemetry import trace
+    tracer = trace.get_tracer("bolt-ai")
+except ImportError:
+    tracer = None
+
+
+@contextmanager
+def medir_fase(tempos: Dict[str, float], fase: str, **atributos):
+    """Mede a duração (relógio monotônico) de uma fase em ms e emite um span OpenTelemetry, se disponível"""
+    span = tracer.start_as_current_span(f"bolt.{fase}", attributes=atributos) if tracer else nullcontext()
+    inicio = time.monotonic()
+    with span:
+        try:
+            yield
+        finally:
+            tempos[f"{fase}_ms"] = round((time.monotonic() - inicio) * 1000, 1)
+
+
+def span_job(job_id: str, idioma: str):
+    """Span raiz de um job, agrupando os spans de cada fase"""
+    if tracer is None:
+        return nullcontext()
+    return tracer.start_as_current_span("bolt.job", attributes={"job.id": job_id, "job.language": idioma})
+
+
+def registrar_uso(usage) -> Optional[Dict[str, int]]:
+    """Extrai o uso de tokens da resposta do chat e anota no span atual"""
+    if usage is None:
+        return None
+
+    uso = {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens,
+    }
+    if tracer is not None:
+        span = trace.get_current_span()
+        for chave, valor in uso.items():
+            span.set_attribute(f"llm.usage.{chave}", valor)
+    return uso
+
+
+def resumir_tempos(jobs: List[Job]) -> dict:
+    """Agrega tempos por fase (média/máximo), por idioma e o total de tokens de um batch"""
+    por_fase: Dict[str, List[float]] = {}
+    por_idioma: Dict[str, Dict[str, List[float]]] = {}
+    total_tokens = 0
+
+    for job in jobs:
+        if job.timings:
+            idioma_tempos = por_idioma.setdefault(job.language, {})
+            for chave, valor in job.timings.items():
+                por_fase.setdefault(chave, []).append(valor)
+                idioma_tempos.setdefault(chave, []).append(valor)
+        if job.usage:
+            total_tokens += job.usage["total_tokens"]
+
+    def media(valores: List[float]) -> float:
+        return round(sum(valores) / len(valores), 1)
+
+    return {
+        "phases": {
+            chave: {"avg_ms": media(valores), "max_ms": max(valores)}
+            for chave, valores in por_fase.items()
+        },
+        "by_language": {
+            idioma: {chave: media(valores) for chave, valores in tempos.items()}
+            for idioma, tempos in por_idioma.items()
+        },
+        "total_tokens": total_tokens,
+    }
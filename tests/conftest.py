@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Os módulos do projeto ficam na raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# geracao.py cria o cliente OpenAI na importação; os testes nunca chamam a API
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
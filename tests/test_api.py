@@ -0,0 +1,33 @@
+from fastapi.testclient import TestClient
+
+import main
+from fila_jobs import FilaJobs
+from modelos import StatusJob
+
+
+def test_batch_status_na_fila_sobrevive_a_reinicio_da_api(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "fila", FilaJobs(str(tmp_path / "fila.db")))
+    client = TestClient(main.app)
+
+    batch_id = client.post(
+        "/generate_batch", json={"titles": ["Bolo"], "languages": ["pt-BR", "en-US"]}
+    ).json()["batch_id"]
+    main.fila.reservar("w1")
+
+    # Simula uma API reiniciada: nada em memória, só a fila
+    main.batches_db.clear()
+    main.jobs_db.clear()
+
+    resposta = client.get(f"/batch_status/{batch_id}")
+    assert resposta.status_code == 200
+    dados = resposta.json()
+    assert dados["batch"]["total_jobs"] == 2
+    assert dados["progress"] == {"completed": 0, "failed": 0, "processing": 1, "pending": 1, "total": 2}
+    assert [job["status"] for job in dados["jobs"]] == [StatusJob.PROCESSING.value, StatusJob.PENDING.value]
+
+
+def test_batch_status_inexistente_na_fila(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "fila", FilaJobs(str(tmp_path / "fila.db")))
+    client = TestClient(main.app)
+
+    assert client.get("/batch_status/nao-existe").status_code == 404
@@ -0,0 +1,76 @@
+import time
+import threading
+
+from fila_jobs import FilaJobs
+from modelos import Job, StatusJob
+
+
+def criar_fila(tmp_path, **kwargs) -> FilaJobs:
+    return FilaJobs(str(tmp_path / "fila.db"), **kwargs)
+
+
+def test_reserva_atomica_entre_workers(tmp_path):
+    fila = criar_fila(tmp_path)
+    fila.enfileirar([Job(id=f"job-{i}", language="pt-BR", batch_id="b") for i in range(50)])
+
+    reservados = []
+    trava = threading.Lock()
+
+    def worker(worker_id: str):
+        # Cada worker abre sua própria conexão, como processos separados
+        fila_worker = criar_fila(tmp_path)
+        while (job := fila_worker.reservar(worker_id)) is not None:
+            with trava:
+                reservados.append(job.id)
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(reservados) == sorted(f"job-{i}" for i in range(50))
+    assert all(job.status == StatusJob.PROCESSING for job in fila.obter_batch("b"))
+
+
+def test_lease_expirado_permite_nova_reserva(tmp_path):
+    fila = criar_fila(tmp_path, lease_segundos=3600)
+    fila.enfileirar([Job(id="job", language="pt-BR")])
+
+    assert fila.reservar("w1").id == "job"
+    assert fila.reservar("w2") is None
+
+    fila.lease_segundos = 0
+    time.sleep(0.01)
+    assert fila.reservar("w2").id == "job"
+
+
+def test_atualizacao_exige_worker_dono(tmp_path):
+    fila = criar_fila(tmp_path, lease_segundos=0)
+    fila.enfileirar([Job(id="job", language="pt-BR")])
+
+    fila.reservar("w1")
+    time.sleep(0.01)
+    fila.reservar("w2")
+
+    assert fila.atualizar("job", "w2", status=StatusJob.COMPLETED, script="roteiro")
+    assert not fila.atualizar("job", "w1", status=StatusJob.FAILED, error="stale")
+
+    job = fila.obter("job")
+    assert job.status == StatusJob.COMPLETED
+    assert job.error is None
+
+
+def test_job_falha_apos_max_tentativas(tmp_path):
+    fila = criar_fila(tmp_path, lease_segundos=0, max_tentativas=2)
+    fila.enfileirar([Job(id="job", language="pt-BR")])
+
+    assert fila.reservar("w1") is not None
+    time.sleep(0.01)
+    assert fila.reservar("w2") is not None
+    time.sleep(0.01)
+    assert fila.reservar("w3") is None
+
+    job = fila.obter("job")
+    assert job.status == StatusJob.FAILED
+    assert "2 tentativas" in job.error
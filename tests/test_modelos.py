@@ -0,0 +1,33 @@
+import orjson
+from fastapi.responses import ORJSONResponse
+
+from modelos import Job, StatusJob
+
+
+def test_updated_at_espelha_created_at():
+    job = Job(id="job", language="pt-BR", created_at=1700000000.5)
+    assert job.updated_at == 1700000000.5
+
+
+def test_atualizar_status_avanca_updated_at():
+    job = Job(id="job", language="pt-BR", created_at=1700000000.5)
+    job.atualizar_status(StatusJob.COMPLETED)
+    assert job.status == StatusJob.COMPLETED
+    assert job.updated_at > job.created_at
+
+
+def test_serializacao_orjson():
+    job = Job(id="job", language="pt-BR", status=StatusJob.PROCESSING, created_at=1700000000.5)
+
+    dados = orjson.loads(ORJSONResponse(job).body)
+
+    assert dados["status"] == "processing"
+    assert type(dados["created_at"]) is float
+    assert type(dados["updated_at"]) is float
+    assert dados["timings"] is None
+    assert dados["usage"] is None
+    assert dados == orjson.loads(orjson.dumps(job))
+
+
+def test_job_usa_slots():
+    assert not hasattr(Job(id="job", language="pt-BR"), "__dict__")
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import pytest
+
+import worker
+from fila_jobs import FilaJobs
+from modelos import Job, StatusJob
+from telemetria import medir_fase, registrar_uso, resumir_tempos
+
+
+def test_medir_fase_registra_tempo_mesmo_com_erro():
+    tempos = {}
+    with pytest.raises(RuntimeError):
+        with medir_fase(tempos, "chat"):
+            raise RuntimeError("falhou")
+
+    assert tempos["chat_ms"] >= 0
+
+
+def test_registrar_uso():
+    assert registrar_uso(None) is None
+    usage = SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+    assert registrar_uso(usage) == {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+
+
+def test_resumir_tempos():
+    jobs = [
+        Job(id="1", language="pt-BR", timings={"chat_ms": 100.0, "tts_ms": 40.0}, usage={"total_tokens": 30}),
+        Job(id="2", language="pt-BR", timings={"chat_ms": 300.0, "tts_ms": 60.0}, usage={"total_tokens": 20}),
+        Job(id="3", language="en-US", timings={"chat_ms": 200.0}, usage=None),
+        Job(id="4", language="en-US"),
+    ]
+
+    resumo = resumir_tempos(jobs)
+
+    assert resumo["phases"] == {
+        "chat_ms": {"avg_ms": 200.0, "max_ms": 300.0},
+        "tts_ms": {"avg_ms": 50.0, "max_ms": 60.0},
+    }
+    assert resumo["by_language"] == {
+        "pt-BR": {"chat_ms": 200.0, "tts_ms": 50.0},
+        "en-US": {"chat_ms": 200.0},
+    }
+    assert resumo["total_tokens"] == 50
+
+
+def test_worker_grava_tempos_e_uso_na_fila(tmp_path, monkeypatch):
+    fila = FilaJobs(str(tmp_path / "fila.db"))
+    fila.enfileirar([Job(id="job", language="pt-BR", title="Bolo")])
+
+    def gerar_roteiro(titulo, idioma, tempos):
+        tempos["prompt_ms"] = 0.1
+        tempos["chat_ms"] = 12.5
+        return "Roteiro", {"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10}
+
+    def gerar_audio(job_id, roteiro, idioma, tempos):
+        tempos["tts_ms"] = 8.0
+        tempos["write_ms"] = 0.2
+        return f"/static/audio/{job_id}.mp3"
+
+    monkeypatch.setattr(worker, "gerar_roteiro", gerar_roteiro)
+    monkeypatch.setattr(worker, "gerar_audio", gerar_audio)
+
+    worker.processar_job_da_fila(fila, fila.reservar("w1"), "w1")
+
+    job = fila.obter("job")
+    assert job.status == StatusJob.COMPLETED
+    assert job.usage == {"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10}
+    assert set(job.timings) == {"queued_ms", "prompt_ms", "chat_ms", "tts_ms", "write_ms", "total_ms"}
+    assert job.timings["chat_ms"] == 12.5
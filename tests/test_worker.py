@@ -0,0 +1,26 @@
+import worker
+from fila_jobs import FilaJobs
+from modelos import Job, StatusJob
+
+
+def test_job_so_de_audio_pula_etapa_de_chat(tmp_path, monkeypatch):
+    fila = FilaJobs(str(tmp_path / "fila.db"))
+    fila.enfileirar([Job(id="job", language="pt-BR", script="Roteiro pronto")])
+
+    def gerar_roteiro(*args):
+        raise AssertionError("job só de áudio não deve chamar o chat")
+
+    def gerar_audio(job_id, roteiro, idioma, tempos):
+        assert roteiro == "Roteiro pronto"
+        tempos["tts_ms"] = 1.0
+        return f"/static/audio/{job_id}.mp3"
+
+    monkeypatch.setattr(worker, "gerar_roteiro", gerar_roteiro)
+    monkeypatch.setattr(worker, "gerar_audio", gerar_audio)
+
+    worker.processar_job_da_fila(fila, fila.reservar("w1"), "w1")
+
+    job = fila.obter("job")
+    assert job.status == StatusJob.COMPLETED
+    assert job.script == "Roteiro pronto"
+    assert job.audio_url == "/static/audio/job.mp3"
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+import socket
+import sqlite3
+import argparse
+
+from fila_jobs import FilaJobs
+from modelos import Job, StatusJob
+from geracao import gerar_roteiro, gerar_audio
+from telemetria import span_job
+
+
+def processar_job_da_fila(fila: FilaJobs, job: Job, worker_id: str):
+    """Processa um job reservado (roteiro + áudio, ou só áudio) e grava o resultado na fila"""
+    inicio = time.monotonic()
+
+    # A espera na fila cruza processos/hosts, então usa o relógio de parede
+    tempos = {"queued_ms": round((time.time() - job.created_at) * 1000, 1)}
+    try:
+        with span_job(job.id, job.language):
+            if job.script is None:
+                roteiro, uso = gerar_roteiro(job.title, job.language, tempos)
+                if not fila.atualizar(job.id, worker_id, script=roteiro, usage=uso, timings=tempos):
+                    print(f"[{job.id}] lease expirado, job reservado por outro worker", file=sys.stderr)
+                    return
+            else:
+                # Job só de áudio (POST /generate_audio): o roteiro já veio pronto
+                roteiro = job.script
+
+            audio_url = gerar_audio(job.id, roteiro, job.language, tempos)
+
+        tempos["total_ms"] = round((time.monotonic() - inicio) * 1000, 1)
+        if fila.atualizar(job.id, worker_id, audio_url=audio_url, status=StatusJob.COMPLETED, timings=tempos):
+            print(f"[{job.id}] concluído ({job.language}) em {tempos['total_ms']} ms")
+        else:
+            print(f"[{job.id}] lease expirado, resultado descartado", file=sys.stderr)
+
+    except Exception as e:
+        tempos["total_ms"] = round((time.monotonic() - inicio) * 1000, 1)
+        fila.atualizar(job.id, worker_id, status=StatusJob.FAILED, error=str(e), timings=tempos)
+        print(f"[{job.id}] falhou: {e}", file=sys.stderr)
+
+
+def executar_worker(fila: FilaJobs, worker_id: str, intervalo: float):
+    """Loop principal: reserva um job por vez e aguarda quando a fila está vazia"""
+    print(f"Worker {worker_id} consumindo {fila.caminho}")
+    while True:
+        try:
+            job = fila.reservar(worker_id)
+            if job is None:
+                time.sleep(intervalo)
+                continue
+            processar_job_da_fila(fila, job, worker_id)
+
+        except sqlite3.Error as e:
+            # Ex.: "database is locked" com muitos workers; o lease devolve o job à fila
+            print(f"Erro na fila ({worker_id}): {e}", file=sys.stderr)
+            time.sleep(intervalo)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Worker Bolt AI: consome jobs da fila compartilhada")
+    parser.add_argument("--db", default=os.getenv("BOLT_FILA_DB", "bolt_jobs.db"),
+                        help="Caminho do banco SQLite da fila (padrão: $BOLT_FILA_DB)")
+    parser.add_argument("--intervalo", type=float, default=1.0,
+                        help="Segundos de espera quando não há jobs pendentes")
+    parser.add_argument("--lease", type=int, default=600,
+                        help="Segundos até um job em processamento ser considerado abandonado")
+    parser.add_argument("--max-tentativas", type=int, default=3,
+                        help="Reservas de um mesmo job antes de marcá-lo como falho")
+    args = parser.parse_args()
+
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    try:
+        executar_worker(FilaJobs(args.db, lease_segundos=args.lease, max_tentativas=args.max_tentativas), worker_id, args.intervalo)
+    except KeyboardInterrupt:
+        print(f"Worker {worker_id} encerrado")